@@ -0,0 +1,138 @@
+# Copyright © 2015-2018 STRG.AT GmbH, Vienna, Austria
+# Copyright © 2019 Necdet Can Ateşman, Vienna, Austria
+#
+# This file is part of the The SCORE Framework.
+#
+# The SCORE Framework and all its parts are free software: you can redistribute
+# them and/or modify them under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation which is in
+# the file named COPYING.LESSER.txt.
+#
+# The SCORE Framework and all its parts are distributed without any WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. For more details see the GNU Lesser General Public
+# License.
+#
+# If you have not received a copy of the GNU Lesser General Public License see
+# http://www.gnu.org/licenses/.
+#
+# The License-Agreement realised between you as Licensee and STRG.AT GmbH as
+# Licenser including the issue of its valid conclusion and its pre- and
+# post-contractual effects is governed by the laws of Austria. Any disputes
+# concerning this License-Agreement including the issue of its valid conclusion
+# and its pre- and post-contractual effects are exclusively decided by the
+# competent court, in whose district STRG.AT GmbH has its registered seat, at
+# the discretion of STRG.AT GmbH also the competent court, in whose district
+# the Licensee has his registered seat, an establishment or assets.
+
+"""
+Measures where the startup cost of an application using :mod:`score.auth` is
+spent: importing the package, importing :class:`~score.auth.RuleSet` for
+defining rules, initializing a minimal application and answering the first
+permission check, which resolves the configured ruleset. Also reports peak
+resident memory and the number of loaded modules. Each measurement is
+performed in a fresh interpreter:
+
+.. code-block:: console
+
+    $ python benchmarks/startup.py --runs 20
+
+Unless a ``--ruleset`` is given, a module defining ``--rules`` rules is
+generated in a temporary folder and configured.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+
+RULES_MODULE = '''
+from score.auth import RuleSet, actor_rule, any_of
+
+ruleset = RuleSet()
+
+
+@actor_rule
+def is_admin(ctx):
+    return ctx.actor == 'admin'
+
+
+for i in range(%d):
+    cls = type('Model%%d' %% i, (), {})
+    ruleset.rule('edit', cls)(any_of(is_admin, lambda ctx, obj: False))
+ruleset.rule('check')(lambda ctx: True)
+'''
+
+
+SCRIPT = '''
+import json, resource, sys, time
+timings = {}
+start = time.perf_counter()
+import score.auth
+timings['import score.auth'] = time.perf_counter() - start
+start = time.perf_counter()
+from score.auth import RuleSet
+timings['from score.auth import RuleSet'] = time.perf_counter() - start
+start = time.perf_counter()
+from score.init import init
+score = init({
+    'score.init': {'modules': 'score.ctx\\nscore.auth'},
+    'auth': {'ruleset': %r},
+})
+timings['init()'] = time.perf_counter() - start
+with score.ctx.Context() as ctx:
+    start = time.perf_counter()
+    ctx.permits(%r)
+    timings['first permits()'] = time.perf_counter() - start
+json.dump({
+    'timings': timings,
+    # ru_maxrss is reported in bytes on macOS, but in KiB elsewhere
+    'maxrss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (
+        1024 if sys.platform == 'darwin' else 1),
+    'modules': len(sys.modules),
+}, sys.stdout)
+'''
+
+
+def measure(ruleset, operation, path):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, (path, env.get('PYTHONPATH'))))
+    output = subprocess.check_output(
+        [sys.executable, '-c', SCRIPT % (ruleset, operation)], env=env)
+    return json.loads(output.decode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--rules', type=int, default=100,
+                        help='number of rules in the generated ruleset')
+    parser.add_argument('--ruleset',
+                        help='dotted path to the ruleset to configure')
+    parser.add_argument('--operation', default='check',
+                        help='operation to check with the first permits()')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as path:
+        ruleset = args.ruleset
+        if ruleset is None:
+            with open(os.path.join(path, 'startup_rules.py'), 'w') as file:
+                file.write(RULES_MODULE % args.rules)
+            ruleset = 'startup_rules.ruleset'
+        results = [measure(ruleset, args.operation, path)
+                   for _ in range(args.runs)]
+    for name in results[0]['timings']:
+        print('%-31s %8.2f ms' % (name + ':', statistics.median(
+            r['timings'][name] for r in results) * 1000))
+    print('%-31s %8d KiB' % ('max rss:', statistics.median(
+        r['maxrss'] for r in results)))
+    print('%-31s %8d' % ('loaded modules:', statistics.median(
+        r['modules'] for r in results)))
+
+
+if __name__ == '__main__':
+    main()
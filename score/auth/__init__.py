@@ -25,12 +25,53 @@
 # the discretion of STRG.AT GmbH also the competent court, in whose district
 # the Licensee has his registered seat, an establishment or assets.
 
-from ._ruleset import RuleSet
-from ._init import init, ConfiguredAuthModule
-from .authenticator import (
-    Authenticator, NullAuthenticator, SessionAuthenticator)
+import importlib
+import sys
 
 __version__ = '0.7.1'
 
 __all__ = ('init', 'ConfiguredAuthModule', 'RuleSet',
-           'Authenticator', 'NullAuthenticator', 'SessionAuthenticator')
+           'actor_rule', 'any_of', 'all_of',
+           'Authenticator', 'NullAuthenticator', 'SessionAuthenticator',
+           'AdaptiveAuthenticator')
+
+# The submodules are only imported once one of their members is accessed,
+# keeping "import score.auth" cheap for applications that just define rules.
+_lazy_members = {
+    'init': '._init',
+    'ConfiguredAuthModule': '._init',
+    'RuleSet': '._ruleset',
+    'actor_rule': '._ruleset',
+    'any_of': '._ruleset',
+    'all_of': '._ruleset',
+    'Authenticator': '.authenticator',
+    'NullAuthenticator': '.authenticator',
+    'SessionAuthenticator': '.authenticator',
+    'AdaptiveAuthenticator': '.authenticator',
+}
+
+_lazy_submodules = ('authenticator',)
+
+
+def __getattr__(name):
+    if name in _lazy_submodules:
+        return importlib.import_module('.' + name, __name__)
+    try:
+        modulename = _lazy_members[name]
+    except KeyError:
+        raise AttributeError(
+            'module %r has no attribute %r' % (__name__, name)) from None
+    value = getattr(importlib.import_module(modulename, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_members) | set(_lazy_submodules))
+
+
+if sys.version_info < (3, 7):
+    # module-level __getattr__ is not supported before python 3.7
+    for _name in _lazy_members:
+        __getattr__(_name)
+    del _name
@@ -26,11 +26,13 @@
 # the Licensee has his registered seat, an establishment or assets.
 
 import logging
+import threading
+from weakref import WeakKeyDictionary
 
 from score.init import (
-    ConfiguredModule, parse_dotted_path, parse_call, parse_list)
+    ConfiguredModule, parse_dotted_path, parse_call, parse_list, parse_bool)
 
-from .authenticator import NullAuthenticator
+from .authenticator import NullAuthenticator, AdaptiveAuthenticator
 from ._ruleset import RuleSet
 
 
@@ -40,7 +42,10 @@ log = logging.getLogger(__package__)
 defaults = {
     'ctx.member': 'actor',
     'authenticators': [],
+    'adaptive': False,
+    'adaptive.interval': 1000,
     'ruleset': None,
+    'ruleset.factory': None,
 }
 
 
@@ -52,12 +57,31 @@ def init(confdict, ctx):
     :confkey:`ruleset` :confdefault:`RuleSet()`
         A dotted path to an instance of :class:`RuleSet` in your project. This
         module will be initialized without any rules, if this configuration key
-        is omitted, resulting in denial of every operation.
+        is omitted, resulting in denial of every operation. The path is only
+        resolved when the ruleset is needed for the first time, usually during
+        the first permission check.
+
+    :confkey:`ruleset.factory` :confdefault:`None`
+        A dotted path to a callable, that creates a new, fully populated
+        :class:`RuleSet`. This callable is used by
+        :meth:`ConfiguredAuthModule.reload`, if it is invoked without
+        arguments.
 
     :confkey:`authenticators` :confdefault:`list()`
         List of :class:`Authenticators` capable of determining the current
         actor.
 
+    :confkey:`adaptive` :confdefault:`False`
+        Whether consecutive :attr:`order independent
+        <.Authenticator.order_independent>` authenticators in the list of
+        :confkey:`authenticators` should be grouped into an
+        :class:`.AdaptiveAuthenticator`, which tries the most effective ones
+        first.
+
+    :confkey:`adaptive.interval` :confdefault:`1000`
+        The number of retrievals after which an adaptive group reorders its
+        members.
+
     :confkey:`ctx.member` :confdefault:`actor`
         The :term:`context member` under which the current actor should be made
         available. Leaving this at its default will allow you to access the
@@ -68,23 +92,54 @@ def init(confdict, ctx):
     conf = defaults.copy()
     conf.update(confdict)
     if conf['ruleset'] in (None, 'None'):
+        ruleset_path = None
         ruleset = RuleSet()
     else:
-        ruleset = parse_dotted_path(conf['ruleset'])
+        ruleset_path = conf['ruleset']
+        ruleset = None
     if 'authenticator' in conf:
         assert not conf['authenticators']
         conf['authenticators'] = [conf['authenticator']]
         del conf['authenticator']
-    auth = ConfiguredAuthModule(ruleset, conf['ctx.member'])
-    authenticator = NullAuthenticator()
-    for line in reversed(parse_list(conf['authenticators'])):
-        authenticator = parse_call(line, (auth, authenticator))
-    auth.authenticator = authenticator
+    ruleset_factory = conf['ruleset.factory']
+    if ruleset_factory in ('', 'None'):
+        ruleset_factory = None
+    auth = ConfiguredAuthModule(ruleset, conf['ctx.member'], ruleset_path,
+                                ruleset_factory)
+    _init_authenticators(conf, auth)
     _register_ctx_actor(conf, ctx, auth)
     _register_ctx_permits(conf, ctx, auth)
     return auth
 
 
+def _init_authenticators(conf, auth):
+    adaptive = parse_bool(conf['adaptive'])
+    interval = int(conf['adaptive.interval'])
+    auth.adaptive_authenticators = []
+    authenticator = NullAuthenticator()
+    group = []
+
+    def create_group():
+        if len(group) == 1:
+            return group[0]
+        result = AdaptiveAuthenticator(auth, authenticator, group, interval)
+        auth.adaptive_authenticators.insert(0, result)
+        return result
+
+    for line in reversed(parse_list(conf['authenticators'])):
+        member = parse_call(line, (auth, authenticator))
+        if adaptive and member.order_independent:
+            group.insert(0, member)
+            continue
+        if group:
+            member.next = create_group()
+            group = []
+        authenticator = member
+    if group:
+        authenticator = create_group()
+    auth.authenticator = authenticator
+
+
 def _register_ctx_actor(conf, ctx_conf, auth_conf):
     def constructor(ctx):
         return auth_conf.authenticator.retrieve(ctx)
@@ -101,8 +156,12 @@ def _register_ctx_actor(conf, ctx_conf, auth_conf):
 
 def _register_ctx_permits(conf, ctx, auth):
     def constructor(ctx):
+        # the ruleset is fixed for the whole lifetime of the context, see
+        # ConfiguredAuthModule.reload()
+        ruleset_permits = auth._ruleset_for(ctx).permits
+
         def permits(operation, *args, raise_=False):
-            return auth.permits(ctx, operation, *args, raise_=raise_)
+            return ruleset_permits(ctx, operation, *args, raise_=raise_)
         return permits
     ctx.register('permits', constructor)
 
@@ -113,14 +172,113 @@ class ConfiguredAuthModule(ConfiguredModule):
     <score.init.ConfiguredModule>`.
     """
 
-    def __init__(self, ruleset, ctx_member):
+    def __init__(self, ruleset, ctx_member, ruleset_path=None,
+                 ruleset_factory=None):
         super().__init__(__package__)
-        self.ruleset = ruleset
         self.ctx_member = ctx_member
+        self.ruleset_path = ruleset_path
+        self.ruleset_factory = ruleset_factory
+        self.ruleset = ruleset
+        self._ctx_rulesets = WeakKeyDictionary()
+        # guards all replacements of the ruleset, so that a slow resolution
+        # of the configured ruleset cannot overwrite a concurrent reload
+        self._ruleset_lock = threading.Lock()
+
+    @property
+    def ruleset(self):
+        ruleset = self._ruleset
+        if ruleset is None:
+            ruleset = self._resolve_ruleset()
+        return ruleset
+
+    @ruleset.setter
+    def ruleset(self, ruleset):
+        if ruleset is not None:
+            ruleset.actor_member = self.ctx_member
+        self._ruleset = ruleset
+
+    def _resolve_ruleset(self):
+        with self._ruleset_lock:
+            if self._ruleset is None:
+                if self.ruleset_path is None:
+                    self.ruleset = RuleSet()
+                else:
+                    self.ruleset = parse_dotted_path(self.ruleset_path)
+            return self._ruleset
 
     def permits(self, ctx, operation, *args, raise_=False):
         """
         A proxy for :meth:`RuleSet.permits` of the configured
         :attr:`ruleset` instance.
+
+        A context will keep using the same :class:`RuleSet` for all its
+        queries, even if a different one is installed via :meth:`reload` in
+        the meantime.
+        """
+        return self._ruleset_for(ctx).permits(
+            ctx, operation, *args, raise_=raise_)
+
+    def reload(self, ruleset=None, *, background=False, strict=True):
         """
-        return self.ruleset.permits(ctx, operation, *args, raise_=raise_)
+        Replaces the current :attr:`ruleset` without interrupting running
+        contexts: these will continue to use the old ruleset, while all
+        contexts querying permissions for the first time will use the new one.
+
+        The *ruleset* may be a :class:`RuleSet` instance, a callable creating
+        one, or a dotted path to either of these. If it is omitted, the
+        configured :confkey:`ruleset.factory` is invoked. The factory must
+        construct a new RuleSet on each call, modules are never re-imported.
+
+        The new ruleset is validated and prepared to answer all queries the
+        current ruleset has received so far before it is installed. The
+        current ruleset is retained if the new one has no rule for any of
+        these queries, unless *strict* is falsy. Pass ``strict=False`` to
+        deliberately remove rules.
+
+        This function returns the new ruleset, unless it was invoked with a
+        truthy *background* value. In that case, the whole operation is
+        performed in a separate thread, which is returned instead. Errors
+        encountered in this thread are logged and the current ruleset is
+        retained.
+        """
+        if not background:
+            return self._reload(ruleset, strict)
+
+        def reload():
+            try:
+                self._reload(ruleset, strict)
+            except Exception:
+                log.exception('Could not reload ruleset')
+
+        thread = threading.Thread(target=reload, name='score.auth reload',
+                                  daemon=True)
+        thread.start()
+        return thread
+
+    def _reload(self, ruleset, strict):
+        with self._ruleset_lock:
+            if ruleset is None:
+                if self.ruleset_factory is None:
+                    raise ValueError('No ruleset factory configured')
+                ruleset = self.ruleset_factory
+            ruleset = parse_dotted_path(ruleset)
+            if not isinstance(ruleset, RuleSet) and callable(ruleset):
+                ruleset = ruleset()
+            if not isinstance(ruleset, RuleSet):
+                raise ValueError('Not a RuleSet: %r' % (ruleset,))
+            ruleset.validate()
+            if self._ruleset is not None:
+                ruleset.prepare(self._ruleset.signatures(), strict=strict)
+            self.ruleset = ruleset
+            log.info('Installed new ruleset')
+            return ruleset
+
+    def _ruleset_for(self, ctx):
+        try:
+            ruleset = self._ctx_rulesets.get(ctx)
+        except TypeError:
+            # this context cannot be referenced weakly
+            return self.ruleset
+        if ruleset is None:
+            ruleset = self._ctx_rulesets.setdefault(ctx, self.ruleset)
+        return ruleset
@@ -25,9 +25,12 @@
 # the discretion of STRG.AT GmbH also the competent court, in whose district
 # the Licensee has his registered seat, an establishment or assets.
 
+import abc
 from collections import OrderedDict
+import functools
 import logging
 import warnings
+from weakref import WeakKeyDictionary
 
 log = logging.getLogger('score.auth')
 
@@ -38,8 +41,16 @@ class RuleSet:
     classes.
     """
 
+    #: The maximum number of ``(operation, argument types)`` combinations,
+    #: for which the responsible rule is remembered.
+    dispatch_size = 1024
+
     def __init__(self):
         self.rules = {}
+        self.actor_member = 'actor'
+        self._actor_memos = WeakKeyDictionary()
+        self._dispatch = {}
+        self._prepared = set()
 
     def rule(self, operation, *args):
         """
@@ -63,17 +74,31 @@ class RuleSet:
             @ruleset.rule('rewrite', Song)
             def rewrite_song(ctx, song):
                 return True  # songs may be rewritten at any time
+
+        Rules composed with :func:`actor_rule`, :func:`any_of` and
+        :func:`all_of` can be registered the same way. Combinations of rules
+        have no name of their own and must always be given an operation:
+
+        .. code-block:: python
+
+            ruleset.rule('edit', Article)(any_of(is_admin, owns_article))
         """
+        if isinstance(operation, _Combination):
+            raise TypeError(
+                'Combined rules have no name, register them with '
+                'rule(operation, *types)(rule) instead')
         if callable(operation):
             if operation.__name__ not in self.rules:
                 self.rules[operation.__name__] = OrderedDict()
             self.rules[operation.__name__][tuple()] = operation
+            self._dispatch.clear()
             return operation
 
         def capturer(func):
             if operation not in self.rules:
                 self.rules[operation] = OrderedDict()
             self.rules[operation][args] = func
+            self._dispatch.clear()
             return func
 
         return capturer
@@ -83,26 +108,266 @@ class RuleSet:
         Checks if given *operation* is allowed on given *args* in given
         *context*.
         """
-        for rule_args, rule_test in self.rules.get(operation, {}).items():
-            if len(args) != len(rule_args):
-                continue
-            for i, arg in enumerate(args):
-                if not isinstance(args[i], rule_args[i]):
-                    break
+        for arg in args:
+            if arg.__class__ is not type(arg):
+                # objects reporting a different __class__ (proxies, mocks)
+                # are matched with isinstance() and never cached by type
+                entry = self._entry(self._find(operation, args, isinstance))
+                break
+        else:
+            key = (operation, tuple(map(type, args)))
+            entry = self._dispatch.get(key)
+            if entry is None:
+                entry = self._lookup(*key)
+            elif self._prepared:
+                self._prepared.discard(key)
+        rule_test, composed = entry
+        if rule_test is not None:
+            if composed:
+                result = rule_test.evaluate(self._actor_memo(ctx), ctx, args)
             else:
                 result = rule_test(ctx, *args)
-                if not result and raise_:
-                    raise NotAuthorized(operation, args)
-                log.debug({'operation': operation,
-                           'args': args,
-                           'result': result})
-                return result
+            if not result and raise_:
+                raise NotAuthorized(operation, args)
+            log.debug({'operation': operation,
+                       'args': args,
+                       'result': result})
+            return result
         warnings.warn('No rules defined for operation "%s(%s)"' %
                       (operation, ','.join(map(str, map(type, args)))))
         if raise_:
             raise NotAuthorized(operation, args)
         return False
 
+    def validate(self):
+        """
+        Checks the integrity of all registered :attr:`rules` and raises a
+        :class:`ValueError` if any of them is invalid.
+        """
+        for operation, rules in self.rules.items():
+            for rule_args, rule_test in rules.items():
+                if not all(_is_classinfo(arg) for arg in rule_args):
+                    raise ValueError(
+                        'Invalid argument types for operation "%s": %r' %
+                        (operation, rule_args))
+                if not callable(rule_test):
+                    raise ValueError(
+                        'Rule for operation "%s(%s)" is not callable' %
+                        (operation, ','.join(map(str, rule_args))))
+
+    def signatures(self):
+        """
+        Provides the list of all ``(operation, argument types)`` tuples this
+        RuleSet was queried with and had a rule for. Signatures passed to
+        :meth:`prepare`, that were not queried since, are not included.
+        """
+        # copies are created without releasing the GIL, the dict may be
+        # modified by concurrent calls to permits() while we iterate
+        items = list(self._dispatch.items())
+        prepared = set(self._prepared)
+        return [signature for signature, (rule_test, _) in items
+                if rule_test is not None and signature not in prepared]
+
+    def prepare(self, signatures, *, strict=True):
+        """
+        Determines the rules responsible for given *signatures* in advance, so
+        that calls to :meth:`permits` with matching arguments need not search
+        for them. The *signatures* are ``(operation, argument types)`` tuples,
+        as returned by :meth:`signatures`. Raises a :class:`ValueError` if
+        there is no rule for any of them, unless *strict* is falsy.
+        """
+        missing = []
+        for operation, arg_types in signatures:
+            arg_types = tuple(arg_types)
+            known = (operation, arg_types) in self._dispatch
+            if self._lookup(operation, arg_types)[0] is None:
+                missing.append('%s(%s)' % (
+                    operation, ','.join(map(str, arg_types))))
+            if not known:
+                self._prepared.add((operation, arg_types))
+        if missing and strict:
+            raise ValueError('No rules defined for operations: %s' %
+                             ', '.join(missing))
+
+    def _lookup(self, operation, arg_types):
+        if len(self._dispatch) >= self.dispatch_size:
+            # types may be created dynamically, do not keep them all alive
+            self._dispatch.clear()
+            self._prepared.clear()
+        entry = self._dispatch[(operation, arg_types)] = self._entry(
+            self._find(operation, arg_types, issubclass))
+        return entry
+
+    def _entry(self, rule_test):
+        # isinstance() checks against the abstract _ComposedRule are rather
+        # slow, the result is therefore stored alongside the rule
+        return rule_test, isinstance(rule_test, _ComposedRule)
+
+    def _find(self, operation, values, matches):
+        for rule_args, rule_test in self.rules.get(operation, {}).items():
+            if len(values) != len(rule_args):
+                continue
+            for i, value in enumerate(values):
+                if not matches(value, rule_args[i]):
+                    break
+            else:
+                return rule_test
+        return None
+
+    def _actor_memo(self, ctx):
+        """
+        Provides the dict caching the results of :func:`actor_rule` predicates
+        for given *ctx*. The cache is discarded whenever the :term:`actor` of
+        the context changes.
+        """
+        actor = getattr(ctx, self.actor_member, None)
+        try:
+            memo_actor, memo = self._actor_memos[ctx]
+        except KeyError:
+            pass
+        except TypeError:
+            # this context cannot be referenced weakly, do not cache anything
+            return {}
+        else:
+            if memo_actor is actor:
+                return memo
+        memo = {}
+        self._actor_memos[ctx] = (actor, memo)
+        return memo
+
+
+def _is_classinfo(value):
+    if isinstance(value, tuple):
+        return all(map(_is_classinfo, value))
+    return isinstance(value, type)
+
+
+class _ComposedRule(abc.ABC):
+    """
+    Base class for rules created by :func:`actor_rule`, :func:`any_of` and
+    :func:`all_of`. Instances can be called like any other rule, but will only
+    make use of the per-context cache if they are invoked through
+    :meth:`RuleSet.permits`.
+    """
+
+    depends_on_object = True
+
+    def __call__(self, ctx, *args):
+        return self.evaluate({}, ctx, args)
+
+    @abc.abstractmethod
+    def evaluate(self, memo, ctx, args):
+        pass
+
+
+class _ActorRule(_ComposedRule):
+
+    depends_on_object = False
+
+    def __init__(self, func):
+        functools.update_wrapper(self, func)
+        self.func = func
+
+    def evaluate(self, memo, ctx, args):
+        try:
+            return memo[self]
+        except KeyError:
+            result = memo[self] = self.func(ctx)
+            return result
+
+
+class _ObjectRule(_ComposedRule):
+
+    def __init__(self, func):
+        self.func = func
+
+    def evaluate(self, memo, ctx, args):
+        return self.func(ctx, *args)
+
+
+class _Combination(_ComposedRule):
+
+    def __init__(self, rules):
+        if not rules:
+            raise ValueError('At least one rule is required')
+        rules = [rule if isinstance(rule, _ComposedRule) else _ObjectRule(rule)
+                 for rule in rules]
+        # sorted() is stable: rules depending on the actor alone are moved to
+        # the front, everything else retains the order it was given in
+        self.rules = tuple(sorted(rules, key=lambda r: r.depends_on_object))
+        self.depends_on_object = any(r.depends_on_object for r in self.rules)
+
+
+class _AnyOf(_Combination):
+
+    def evaluate(self, memo, ctx, args):
+        result = False
+        for rule in self.rules:
+            result = rule.evaluate(memo, ctx, args)
+            if result:
+                break
+        return result
+
+
+class _AllOf(_Combination):
+
+    def evaluate(self, memo, ctx, args):
+        result = True
+        for rule in self.rules:
+            result = rule.evaluate(memo, ctx, args)
+            if not result:
+                break
+        return result
+
+
+def actor_rule(func):
+    """
+    Marks a function as depending on the :term:`actor` alone. The function
+    receives the context as its only argument and its result is computed only
+    once per context (or until the actor of the context changes), when used
+    inside a :class:`RuleSet`:
+
+    .. code-block:: python
+
+        @actor_rule
+        def is_admin(ctx):
+            return ctx.actor is not None and ctx.actor.is_admin
+
+    The returned object can be registered as a rule of its own, or combined
+    with other rules using :func:`any_of` and :func:`all_of`.
+    """
+    return _ActorRule(func)
+
+
+def any_of(*rules):
+    """
+    Combines given *rules* into a single rule, that permits an operation if
+    any of the *rules* does. Rules created with :func:`actor_rule` are always
+    evaluated first, the remaining rules are not consulted at all if one of
+    these already permits the operation:
+
+    .. code-block:: python
+
+        def owns_article(ctx, article):
+            return article.owner_id == ctx.actor.id
+
+        ruleset.rule('edit', Article)(any_of(is_admin, owns_article))
+    """
+    return _AnyOf(rules)
+
+
+def all_of(*rules):
+    """
+    Combines given *rules* into a single rule, that permits an operation only
+    if all *rules* do. Just like with :func:`any_of`, rules created with
+    :func:`actor_rule` are evaluated first and the remaining rules are skipped
+    if one of these already denies the operation.
+
+    Both functions require at least one rule and raise a :class:`ValueError`
+    otherwise, an empty combination must not permit everything.
+    """
+    return _AllOf(rules)
+
 
 class NotAuthorized(Exception):
     """
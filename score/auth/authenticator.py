@@ -25,15 +25,25 @@
 # the discretion of STRG.AT GmbH also the competent court, in whose district
 # the Licensee has his registered seat, an establishment or assets.
 
-import pickle
-from score.init import parse_dotted_path
+from collections import deque
+import threading
+import time
 
 
 class Authenticator:
     """
     An object that can query (and possibly remember) the currently acting user.
+
+    Authenticators setting :attr:`order_independent` to `True` may be
+    reordered by an :class:`AdaptiveAuthenticator`. Such an authenticator must
+    return whatever its :attr:`next` authenticator returns, if it cannot
+    determine the actor itself. The optional :attr:`priority` causes it to be
+    tried before all other authenticators in its group, lower values first.
     """
 
+    order_independent = False
+    priority = None
+
     def __init__(self, conf, next):
         self.conf = conf
         self.next = next
@@ -71,6 +81,7 @@ class SessionAuthenticator(Authenticator):
         super().__init__(conf, next)
         self.session_key = session_key
         if isinstance(actor_class, str):
+            from score.init import parse_dotted_path
             actor_class = parse_dotted_path(actor_class)
         self.dbcls = actor_class
 
@@ -95,11 +106,177 @@ class SessionAuthenticator(Authenticator):
 
     def _dump(self, actor):
         if self.dbcls is None:
+            import pickle
             return pickle.dumps(actor)
         assert actor.id, "Actor has no id, missing call to session.flush()?"
         return actor.id
 
     def _load(self, ctx, data):
         if self.dbcls is None:
+            import pickle
             return pickle.loads(data)
         return ctx.db.query(self.dbcls).get(data)
+
+
+class AdaptiveAuthenticator(Authenticator):
+    """
+    Consults a group of :attr:`order independent
+    <Authenticator.order_independent>` authenticators, trying the most
+    effective ones first. The group is reordered after every *interval*
+    retrievals: members with a :attr:`~Authenticator.priority` come first,
+    followed by all others sorted by the share of the group's retrievals they
+    resolved, divided by their average duration.
+
+    Actors are always stored in all members, followed by the :attr:`next`
+    authenticator, regardless of the current order or of the member
+    initiating the storage.
+
+    The statistics are not collected under a lock and are therefore only
+    approximate in multithreaded environments.
+    """
+
+    def __init__(self, conf, next, members, interval=1000):
+        super().__init__(conf, next)
+        self.members = tuple(members)
+        self.interval = interval
+        self.decisions = deque(maxlen=10)
+        self._stats = dict((member, _Stats()) for member in self.members)
+        self._retrievals = 0
+        self._total = 0
+        self._reorder_lock = threading.Lock()
+        self._storing = threading.local()
+        for member in self.members:
+            member.next = _GroupLink(self, member)
+        self.order = self._sort(self.members)
+
+    def retrieve(self, ctx):
+        for member in self.order:
+            stats = self._stats[member]
+            start = time.perf_counter()
+            actor = member.retrieve(ctx)
+            stats.duration += time.perf_counter() - start
+            stats.calls += 1
+            if actor is not _MISS:
+                stats.hits += 1
+                break
+        else:
+            actor = self.next.retrieve(ctx)
+        self._total += 1
+        self._retrievals += 1
+        if self._retrievals >= self.interval:
+            self.reorder()
+        return actor
+
+    def store(self, ctx, actor):
+        self._store(ctx, actor)
+
+    def stats(self):
+        """
+        Returns a list of dicts describing the members in their current order.
+        Each dict contains the ``authenticator`` itself, the number of
+        ``calls`` and ``hits`` and the total ``duration`` of all calls in
+        seconds, as well as the ``score`` used for ordering. The numbers are
+        halved on each :meth:`reorder` and may thus be fractional.
+        """
+        return [self._stats[member].describe(member, self._total)
+                for member in self.order]
+
+    def reorder(self):
+        """
+        Sorts the members using the statistics collected so far and records
+        the decision in :attr:`decisions`. The statistics are halved
+        afterwards, allowing the order to adjust to changing traffic patterns.
+        """
+        if not self._reorder_lock.acquire(blocking=False):
+            return
+        try:
+            self._retrievals = 0
+            order = self._sort(self.members)
+            self.decisions.append({
+                'time': time.time(),
+                'order': order,
+                'stats': [self._stats[member].describe(member, self._total)
+                          for member in order],
+            })
+            self.order = order
+            self._total /= 2
+            for stats in self._stats.values():
+                stats.decay()
+        finally:
+            self._reorder_lock.release()
+
+    def _sort(self, members):
+        fixed = [m for m in members if m.priority is not None]
+        fixed.sort(key=lambda m: m.priority)
+        adaptive = [m for m in members if m.priority is None]
+        adaptive.sort(key=lambda m: self._stats[m].score(self._total),
+                      reverse=True)
+        return tuple(fixed + adaptive)
+
+    def _store(self, ctx, actor, initiator=None):
+        if getattr(self._storing, 'active', False):
+            # a member forwarding the actor to its next authenticator while
+            # we are already distributing it to all members
+            return
+        self._storing.active = True
+        try:
+            for member in self.members:
+                if member is not initiator:
+                    member.store(ctx, actor)
+        finally:
+            self._storing.active = False
+        self.next.store(ctx, actor)
+
+
+_MISS = object()
+
+
+class _GroupLink:
+    """
+    The :attr:`~Authenticator.next` authenticator of each member of an
+    :class:`AdaptiveAuthenticator`.
+    """
+
+    def __init__(self, group, member):
+        self.group = group
+        self.member = member
+
+    def retrieve(self, ctx):
+        return _MISS
+
+    def store(self, ctx, actor):
+        self.group._store(ctx, actor, self.member)
+
+
+class _Stats:
+
+    def __init__(self):
+        self.calls = 0
+        self.hits = 0
+        self.duration = 0.0
+
+    def score(self, retrievals):
+        """
+        The share of all *retrievals* of the group this member resolved,
+        divided by its average duration. Unlike the ratio of hits to calls,
+        the share does not depend on the member's position in the group.
+        """
+        if not self.calls or not retrievals:
+            return 0.0
+        hit_share = self.hits / retrievals
+        return hit_share / max(self.duration / self.calls, 1e-9)
+
+    def decay(self):
+        # all values are scaled alike, keeping averages and rates intact
+        self.calls /= 2
+        self.hits /= 2
+        self.duration /= 2
+
+    def describe(self, member, retrievals):
+        return {
+            'authenticator': member,
+            'calls': self.calls,
+            'hits': self.hits,
+            'duration': self.duration,
+            'score': self.score(retrievals),
+        }
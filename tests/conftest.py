@@ -0,0 +1,16 @@
+import pytest
+from score.init import init
+
+
+@pytest.fixture
+def init_app():
+    """
+    Provides a function initializing score.ctx and score.auth with given
+    configuration for the auth module.
+    """
+    def init_score(**authconf):
+        return init({
+            'score.init': {'modules': 'score.ctx\nscore.auth'},
+            'auth': authconf,
+        })
+    return init_score
@@ -0,0 +1,126 @@
+import pytest
+from score.auth import authenticator
+from score.auth.authenticator import (
+    Authenticator, NullAuthenticator, AdaptiveAuthenticator,
+    SessionAuthenticator, _Stats)
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(authenticator, 'time', clock)
+    return clock
+
+
+class Recorder(Authenticator):
+
+    def __init__(self, name, stored, next=None):
+        super().__init__(None, next)
+        self.name = name
+        self.stored = stored
+
+    def store(self, ctx, actor):
+        self.stored.append(self.name)
+        self.next.store(ctx, actor)
+
+
+class Login(Recorder):
+    order_independent = True
+
+    def retrieve(self, ctx):
+        if ctx == 'login':
+            self.next.store(ctx, 'bob')
+            return 'bob'
+        return self.next.retrieve(ctx)
+
+
+class Token(Recorder):
+    order_independent = True
+
+    def __init__(self, name, stored, clock=None, cost=1):
+        super().__init__(name, stored)
+        self.clock = clock
+        self.cost = cost
+
+    def retrieve(self, ctx):
+        if self.clock:
+            self.clock.now += self.cost
+        if ctx == self.name:
+            return self.name
+        return self.next.retrieve(ctx)
+
+
+def test_store_reaches_all_members_in_any_order():
+    stored = []
+    tail = Recorder('tail', stored, NullAuthenticator())
+    members = [Token('a', stored), Login('login', stored), Token('b', stored)]
+    group = AdaptiveAuthenticator(None, tail, members)
+    for order in (tuple(members), tuple(reversed(members))):
+        group.order = order
+        del stored[:]
+        group.store(None, 'alice')
+        assert sorted(stored) == ['a', 'b', 'login', 'tail']
+
+
+def test_store_initiated_by_member():
+    stored = []
+    tail = Recorder('tail', stored, NullAuthenticator())
+    members = [Token('a', stored), Login('login', stored), Token('b', stored)]
+    group = AdaptiveAuthenticator(None, tail, members)
+    group.order = tuple(reversed(members))
+    assert group.retrieve('login') == 'bob'
+    assert sorted(stored) == ['a', 'b', 'tail']
+
+
+def test_session_authenticator_is_not_grouped(init_app):
+    app = init_app(adaptive='true', authenticators='\n'.join([
+        'score.auth.authenticator.SessionAuthenticator',
+        'score.auth.authenticator.SessionAuthenticator(session_key=other)',
+    ]))
+    assert not SessionAuthenticator.order_independent
+    assert app.auth.adaptive_authenticators == []
+
+
+def test_priority_comes_first(clock):
+    stored = []
+    members = [Token('a', stored, clock), Token('b', stored, clock)]
+    members[0].priority = 1
+    group = AdaptiveAuthenticator(None, NullAuthenticator(), members, 10)
+    for _ in range(100):
+        group.retrieve('b')
+    assert group.order == tuple(members)
+
+
+def test_order_stable_under_fixed_traffic(clock):
+    stored = []
+    rare = Token('rare', stored, clock)
+    common = Token('common', stored, clock)
+    group = AdaptiveAuthenticator(
+        None, NullAuthenticator(), [rare, common], interval=1000)
+    for i in range(40000):
+        assert group.retrieve('rare' if i % 20 == 0 else 'common')
+    assert len(group.decisions) == 10
+    for decision in group.decisions:
+        assert decision['order'] == (common, rare)
+    assert group.order == (common, rare)
+
+
+def test_decay_keeps_averages():
+    stats = _Stats()
+    stats.calls, stats.hits, stats.duration = 1, 1, 3.0
+    score = stats.score(2)
+    stats.decay()
+    assert stats.duration / stats.calls == 3.0
+    assert stats.score(1) == score > 0
@@ -0,0 +1,112 @@
+import subprocess
+import sys
+import threading
+
+import pytest
+from score.auth import RuleSet
+
+
+def run(code):
+    return subprocess.check_output(
+        [sys.executable, '-c', code]).decode('utf-8').strip()
+
+
+def test_import_loads_no_submodules():
+    assert run(
+        'import sys, score.auth\n'
+        'print(sorted(m for m in sys.modules if m.startswith("score.")))'
+    ) == "['score.auth']"
+
+
+def test_members_loaded_on_access():
+    assert run(
+        'import sys\n'
+        'from score.auth import RuleSet\n'
+        'print("score.auth._ruleset" in sys.modules,\n'
+        '      "score.auth._init" in sys.modules,\n'
+        '      "score.init" in sys.modules)'
+    ) == 'True False False'
+
+
+def test_lazy_attributes():
+    import score.auth
+    assert score.auth.RuleSet is RuleSet
+    assert score.auth.authenticator.Authenticator is \
+        score.auth.Authenticator
+    assert 'SessionAuthenticator' in dir(score.auth)
+    with pytest.raises(AttributeError):
+        score.auth.nonexistent
+
+
+class ContentionLock:
+    """
+    A lock recording whether a thread had to wait for it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.contended = threading.Event()
+
+    def __enter__(self):
+        if not self.lock.acquire(blocking=False):
+            self.contended.set()
+            self.lock.acquire()
+
+    def __exit__(self, *exc_info):
+        self.lock.release()
+
+
+@pytest.fixture
+def rules_module(tmp_path, monkeypatch):
+    name = 'lazy_rules_%s' % tmp_path.name.replace('-', '_')
+    tmp_path.joinpath(name + '.py').write_text(
+        'from score.auth import RuleSet\n'
+        'ruleset = RuleSet()\n'
+        'ruleset.rule("dance")(lambda ctx: True)\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield name
+    sys.modules.pop(name, None)
+
+
+def test_ruleset_resolved_on_first_permits(init_app, rules_module):
+    app = init_app(ruleset=rules_module + '.ruleset')
+    assert rules_module not in sys.modules
+    with app.ctx.Context() as ctx:
+        assert ctx.permits('dance')
+    assert rules_module in sys.modules
+    assert app.auth.ruleset is sys.modules[rules_module].ruleset
+    assert app.auth.ruleset.actor_member == 'actor'
+
+
+def test_resolution_does_not_overwrite_reload(init_app, tmp_path,
+                                              monkeypatch):
+    tmp_path.joinpath('slow_gate.py').write_text(
+        'import threading\n'
+        'started = threading.Event()\n'
+        'release = threading.Event()\n')
+    tmp_path.joinpath('slow_rules.py').write_text(
+        'import slow_gate\n'
+        'from score.auth import RuleSet\n'
+        'slow_gate.started.set()\n'
+        'slow_gate.release.wait(5)\n'
+        'ruleset = RuleSet()\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import slow_gate
+    try:
+        app = init_app(ruleset='slow_rules.ruleset')
+        lock = app.auth._ruleset_lock = ContentionLock()
+        new = RuleSet()
+        resolver = threading.Thread(target=lambda: app.auth.ruleset)
+        resolver.start()
+        assert slow_gate.started.wait(5)
+        reloader = threading.Thread(target=lambda: app.auth.reload(new))
+        reloader.start()
+        # the reloader must be waiting for the resolver to finish
+        assert lock.contended.wait(5)
+        slow_gate.release.set()
+        resolver.join()
+        reloader.join()
+        assert app.auth.ruleset is new
+    finally:
+        for name in ('slow_gate', 'slow_rules'):
+            sys.modules.pop(name, None)
@@ -0,0 +1,144 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+from score.auth import RuleSet
+
+
+class Song:
+    pass
+
+
+def make_ruleset(result):
+    ruleset = RuleSet()
+    ruleset.rule('sing', Song)(lambda ctx, song: result)
+    return ruleset
+
+
+@pytest.fixture
+def rules_module(tmp_path, monkeypatch):
+    tmp_path.joinpath('reload_rules.py').write_text(
+        'from score.auth import RuleSet\n'
+        'ruleset = RuleSet()\n'
+        'def create_ruleset():\n'
+        '    ruleset = RuleSet()\n'
+        '    ruleset.rule("dance")(lambda ctx: "new")\n'
+        '    return ruleset\n'
+        'ruleset.rule("dance")(lambda ctx: "old")\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return 'reload_rules'
+
+
+def test_running_contexts_keep_old_ruleset(init_app):
+    app = init_app()
+    app.auth.ruleset = make_ruleset(True)
+    with app.ctx.Context() as old_ctx:
+        assert old_ctx.permits('sing', Song())
+        app.auth.reload(make_ruleset(False))
+        assert old_ctx.permits('sing', Song())
+        with app.ctx.Context() as new_ctx:
+            assert not new_ctx.permits('sing', Song())
+
+
+def test_reload_with_configured_factory(init_app, rules_module):
+    app = init_app(**{'ruleset': rules_module + '.ruleset',
+                      'ruleset.factory': rules_module + '.create_ruleset'})
+    with app.ctx.Context() as ctx:
+        assert ctx.permits('dance') == 'old'
+    new = app.auth.reload()
+    assert new is app.auth.ruleset
+    with app.ctx.Context() as ctx:
+        assert ctx.permits('dance') == 'new'
+
+
+def test_reload_without_factory(init_app):
+    with pytest.raises(ValueError):
+        init_app().auth.reload()
+
+
+def test_reload_rejects_missing_rules(init_app):
+    app = init_app()
+    app.auth.ruleset = old = make_ruleset(True)
+    with app.ctx.Context() as ctx:
+        assert ctx.permits('sing', Song())
+    with pytest.raises(ValueError):
+        app.auth.reload(RuleSet())
+    assert app.auth.ruleset is old
+
+
+def test_background_reload_failure_keeps_ruleset(init_app):
+    app = init_app()
+    app.auth.ruleset = old = make_ruleset(True)
+    app.auth.reload(object(), background=True).join()
+    assert app.auth.ruleset is old
+
+
+def test_tuple_argument_types(init_app):
+    ruleset = RuleSet()
+    ruleset.rule('sing', (Song, str))(lambda ctx, song: True)
+    ruleset.validate()
+    app = init_app()
+    app.auth.reload(ruleset)
+    with app.ctx.Context() as ctx:
+        assert ctx.permits('sing', 'Galaxy Song')
+        assert ctx.permits('sing', Song())
+
+
+def test_objects_disguising_their_class():
+    ruleset = make_ruleset(True)
+    assert ruleset.permits(None, 'sing', Mock(spec=Song))
+    with pytest.warns(UserWarning):
+        assert not ruleset.permits(None, 'sing', Mock())
+
+
+def test_reload_not_strict_removes_rules(init_app):
+    app = init_app()
+    app.auth.ruleset = make_ruleset(True)
+    with app.ctx.Context() as ctx:
+        assert ctx.permits('sing', Song())
+    new = RuleSet()
+    assert app.auth.reload(new, strict=False) is new
+    with app.ctx.Context() as ctx:
+        with pytest.warns(UserWarning):
+            assert not ctx.permits('sing', Song())
+
+
+def test_prepared_signatures_not_carried_forward():
+    old = make_ruleset(True)
+    assert old.permits(None, 'sing', Song())
+    assert old.signatures() == [('sing', (Song,))]
+    new = make_ruleset(True)
+    new.prepare(old.signatures())
+    assert new.signatures() == []
+    RuleSet().prepare(new.signatures())
+    assert new.permits(None, 'sing', Song())
+    assert new.signatures() == [('sing', (Song,))]
+
+
+def test_signatures_during_concurrent_permits():
+    ruleset = RuleSet()
+    ruleset.rule('sing', object)(lambda ctx, obj: True)
+    ruleset.dispatch_size = 10 ** 6
+
+    def query(count):
+        for _ in range(count):
+            ruleset.permits(None, 'sing', type('Dynamic', (), {})())
+
+    # a long iteration makes a thread switch during signatures() likely
+    query(20000)
+    thread = threading.Thread(target=query, args=(20000,))
+    thread.start()
+    try:
+        while thread.is_alive():
+            ruleset.signatures()
+    finally:
+        thread.join()
+
+
+def test_dispatch_size_is_limited():
+    ruleset = RuleSet()
+    ruleset.rule('sing', object)(lambda ctx, obj: True)
+    ruleset.dispatch_size = 10
+    for _ in range(50):
+        assert ruleset.permits(None, 'sing', type('Dynamic', (), {})())
+    assert len(ruleset.signatures()) <= 10
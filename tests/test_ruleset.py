@@ -0,0 +1,107 @@
+import pytest
+from score.auth import RuleSet, actor_rule, any_of, all_of
+
+
+class Article:
+
+    def __init__(self, owner):
+        self.owner = owner
+
+
+def owns(ctx, article):
+    return article.owner == ctx.actor
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def ruleset(calls):
+    ruleset = RuleSet()
+
+    @actor_rule
+    def is_admin(ctx):
+        calls.append(ctx.actor)
+        return ctx.actor == 'admin'
+
+    ruleset.rule('edit', Article)(any_of(owns, is_admin))
+    ruleset.rule('delete', Article)(all_of(is_admin, owns))
+    ruleset.rule(is_admin)
+    return ruleset
+
+
+@pytest.fixture
+def app(init_app, ruleset):
+    app = init_app()
+    app.auth.ruleset = ruleset
+    return app
+
+
+def test_actor_rule_evaluated_once_per_ctx(app, calls):
+    with app.ctx.Context() as ctx:
+        ctx.actor = 'admin'
+        for _ in range(5):
+            assert ctx.permits('edit', Article('someone'))
+        assert ctx.permits('is_admin')
+    assert calls == ['admin']
+
+
+def test_actor_rule_evaluated_per_ctx(app, calls):
+    for _ in range(2):
+        with app.ctx.Context() as ctx:
+            ctx.actor = 'admin'
+            assert ctx.permits('is_admin')
+    assert calls == ['admin', 'admin']
+
+
+def test_actor_memo_invalidated_on_actor_change(app, calls):
+    with app.ctx.Context() as ctx:
+        ctx.actor = 'admin'
+        assert ctx.permits('edit', Article('someone'))
+        ctx.actor = 'bob'
+        assert not ctx.permits('edit', Article('someone'))
+        assert ctx.permits('edit', Article('bob'))
+    assert calls == ['admin', 'bob']
+
+
+def test_object_rule_skipped_when_actor_rule_decides(ruleset, app):
+    def fail(ctx, article):
+        raise AssertionError('object rule should not be evaluated')
+    is_admin = ruleset.rules['is_admin'][()]
+    ruleset.rule('publish', Article)(any_of(fail, is_admin))
+    with app.ctx.Context() as ctx:
+        ctx.actor = 'admin'
+        assert ctx.permits('publish', Article('someone'))
+
+
+def test_all_of(app):
+    with app.ctx.Context() as ctx:
+        ctx.actor = 'admin'
+        assert ctx.permits('delete', Article('admin'))
+        assert not ctx.permits('delete', Article('someone'))
+        ctx.actor = 'bob'
+        assert not ctx.permits('delete', Article('bob'))
+
+
+def test_composed_rules_callable_directly():
+    rule = any_of(owns, actor_rule(lambda ctx: False))
+
+    class Ctx:
+        actor = 'bob'
+
+    assert rule(Ctx(), Article('bob'))
+    assert not rule(Ctx(), Article('alice'))
+
+
+def test_registering_combination_without_operation(ruleset):
+    with pytest.raises(TypeError):
+        ruleset.rule(any_of(owns))
+
+
+def test_empty_combinations():
+    with pytest.raises(ValueError):
+        all_of()
+    with pytest.raises(ValueError):
+        any_of()